@@ -24,16 +24,62 @@ import os
 import sys
 import shutil
 import re
-from typing import Any, List, Tuple, Mapping, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple, Mapping, Optional
 
-from rich.console import Console
-from rich.theme import Theme
-from ruamel.yaml import YAML
-from ruamel.yaml.error import YAMLError
+if TYPE_CHECKING:
+    from rich.console import Console
+    from ruamel.yaml import YAML
 
 # init params
-console: Console = Console(theme=Theme(inherit=False))
-print = console.print
+_LEVELS: Mapping[str, str] = {
+    "info": "[blue]Info[/]       ",
+    "warn": "[yellow]Warning[/]    ",
+    "error": "[red]Error[/]      ",
+    "debug": "[bright_black]Debug[/]      ",
+    "crit": "[red bold]Critical[/]   "
+}
+_IMPORT_PREFIX: bytes = b"@import url(\""
+_IMPORT_SUFFIX: bytes = b"\");"
+# (the metadata is usually located in the first few hundred bytes)
+_METADATA_PREFIX_SIZE: int = 4096
+_CONFIG_FILENAMES: Tuple[str, ...] = ("bdproject.yml", "bdproject.yaml")
+_METRICS: Tuple[str, ...] = ("bytes", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
+
+# pre-compiled patterns
+# (the code is processed as UTF-8 bytes, so these are bytes patterns)
+_METADATA_BLOCK_RE = re.compile(rb"/\*\*.*?\*/", re.S)
+_METADATA_KV_RE = re.compile(rb"@([a-zA-Z]+) +((?:[^\r\n*]|\*(?!/))+)")
+_STRIP_NEWLINES_RE = re.compile(rb"\s*\n\s*")
+_PLACEHOLDER_RE = re.compile(r"\$([a-z]+)")
+_COMMENT_RE = re.compile(rb"/\*.*?\*/", re.S)
+_BRACE_RE = re.compile(rb" *\{")
+_COLON_RE = re.compile(rb": *")
+_COMMA_RE = re.compile(rb" *, *")
+_BANG_RE = re.compile(rb" *!important")
+
+
+@lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    """:class:`rich.console.Console`: Gets the console for log messages
+    
+    `rich` is imported only on the first call to keep startup fast"""
+    from rich.console import Console
+    from rich.theme import Theme
+
+    return Console(theme=Theme(inherit=False))
+
+
+@lru_cache(maxsize=1)
+def _get_yaml() -> "YAML":
+    """:class:`ruamel.yaml.YAML`: Gets the loader of project configuration
+    
+    `ruamel.yaml` is imported only on the first call to keep startup fast"""
+    from ruamel.yaml import YAML
+
+    # "safe" mode uses the libyaml-based loader when it is available
+    return YAML(typ="safe")
 
 
 def humonize(size: int) -> str:
@@ -43,15 +89,19 @@ def humonize(size: int) -> str:
     ----------
     size: :class:`int`
         The input size in bytes"""
-    metrics: List[str] = ["bytes", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB"]
-    metric: int = 0
-    final_size: float = size
+    if size < 1024:
+        return f"{size} {_METRICS[0]}"
 
-    while final_size >= 1024 and metric < len(metrics) - 1:
-        final_size = final_size / 1024
+    # Every metric is 2**10 times bigger than the previous one
+    metric: int = min((size.bit_length() - 1) // 10, len(_METRICS) - 1)
+    final_size: float = size / (1 << (metric * 10))
+
+    # Sizes right below the next metric can be rounded up to 1024.0
+    if final_size >= 1024 and metric < len(_METRICS) - 1:
         metric += 1
+        final_size = size / (1 << (metric * 10))
 
-    return f"{round(final_size, 2)} {metrics[metric]}"
+    return f"{round(final_size, 2)} {_METRICS[metric]}"
 
 
 def log(level: str, content: str) -> None:
@@ -64,35 +114,29 @@ def log(level: str, content: str) -> None:
 
     content: :class:`str`
         The content of error message"""
-    if level.lower() == "info":
-        print(f"[blue]Info[/]       {content}")
-
-    if level.lower() == "warn":
-        print(f"[yellow]Warning[/]    {content}")
+    level = level.lower()
+    prefix: Optional[str] = _LEVELS.get(level)
+    if prefix is None:
+        return
 
-    if level.lower() == "error":
-        print(f"[red]Error[/]      {content}")
-
-    if level.lower() == "debug":
-        print(f"[bright_black]Debug[/]      {content}")
-
-    if level.lower() == "crit":
-        print(f"[red bold]Critical[/]   {content}")
-        exit(0)
+    _get_console().print(f"{prefix}{content}")
+    if level == "crit":
+        sys.exit(1)
 
 
 def find_config() -> Mapping[str, Any]:
     """Mapping[:class:`str`, :class:`Any`]: Tries to find and load the project configuration"""
-    if "bdproject" not in [re.sub(r"\.ya?ml", "", f) for f in os.listdir()]:
+    for filename in _CONFIG_FILENAMES:
+        if os.path.isfile(filename):
+            break
+
+    else:
         log("crit", "Project configuration file not found. Please create it.")
 
-    filename: str = [f for f in os.listdir() if f.startswith("bdproject")][0]
-    if not filename.endswith((".yml", ".yaml")):
-        log("crit", "The found project configuration file is not a YAML file.")
+    from ruamel.yaml.error import YAMLError
 
     try:
-        with open(filename, "r", encoding="utf-8") as reader:
-            data: Mapping[str, Any] = YAML().load(reader)
+        data: Mapping[str, Any] = _get_yaml().load(Path(filename).read_bytes())
 
     except YAMLError:
         log("crit", "Failed to process project configuration.")
@@ -107,89 +151,132 @@ def find_config() -> Mapping[str, Any]:
     return {}
 
 
-def find_betterdiscord() -> str:
-    """:class:`str`: Tries to find the BetterDiscord folder"""
-    platform: str = sys.platform
-    folder: str = ""
+def _get_windows_folder() -> str:
+    """:class:`str`: Gets the BetterDiscord folder on Windows
+    
+    Returns an empty string when `AppData` is not set"""
+    appdata: Optional[str] = os.environ.get("AppData")
+    if not appdata:
+        return ""
+
+    return os.path.join(appdata, "BetterDiscord")
 
-    # User system is Windows
-    if platform.startswith("win32"):
-        appdata: Optional[str] = os.environ.get("AppData")
-        folder = f"{appdata}\\BetterDiscord"
 
-    # User system is MacOS
-    if platform.startswith("darwin"):
-        folder = "~/Library/Application Support/BetterDiscord"
+_BETTERDISCORD_FOLDERS: Mapping[str, Callable[[], str]] = {
+    "win32": _get_windows_folder,
+    "darwin": lambda: os.path.expanduser("~/Library/Application Support/BetterDiscord"),
+    "linux": lambda: os.path.expanduser("~/.config/BetterDiscord")
+}
 
-    # User system is Linux
-    if platform.startswith("linux"):
-        folder = "~/.config/BetterDiscord/"
 
-    if not os.path.exists(folder):
+@lru_cache(maxsize=1)
+def find_betterdiscord() -> str:
+    """:class:`str`: Tries to find the BetterDiscord folder"""
+    platform: str = sys.platform
+    getter: Callable[[], str] = (
+        _BETTERDISCORD_FOLDERS.get(platform)
+        or _BETTERDISCORD_FOLDERS.get(platform.rstrip("0123456789"))
+        # Other systems are expected to follow the Linux layout
+        or _BETTERDISCORD_FOLDERS["linux"]
+    )
+
+    folder: str = getter()
+    if not folder or not os.path.isdir(folder):
         log("crit", "Couldn't find BetterDiscord folder!")
 
     return folder
 
 
-def get_metadata(input: str) -> Tuple[str, Mapping[str, Any]]:
-    """Mapping[:class:`str`, :class:`Any`]: Tries to find and parse project metadata
+def get_metadata(input: bytes) -> Tuple[bytes, Mapping[str, Any]]:
+    """Tuple[:class:`bytes`, Mapping[:class:`str`, :class:`Any`]]: Finds and parses project metadata
     
     Parameters
     ----------
-    input: :class:`str`
+    input: :class:`bytes`
         The code (content) of input file"""
-    output: Mapping[str, Any] = {}
-
-    metadata: List[str] = re.findall(r"/\*\*.*\*/", input, re.S)
-    if len(metadata) < 1:
+    # The metadata is usually located at the very beginning of the file,
+    # so look there first and only then fall back to the whole code
+    metadata: Optional["re.Match[bytes]"]
+    metadata = _METADATA_BLOCK_RE.search(input, 0, _METADATA_PREFIX_SIZE)
+    if metadata is None:
+        metadata = _METADATA_BLOCK_RE.search(input)
+
+    if metadata is None:
         log("crit", "Could not find metadata!")
 
-    for key, value in re.findall(r"@([a-zA-Z]+) (.*)", metadata[0]):
-        output[key] = value
+    block: bytes = metadata.group(0)
+    output: Mapping[str, Any] = {
+        key.decode("utf8"): value.rstrip().decode("utf8")
+        for key, value in _METADATA_KV_RE.findall(block)
+    }
 
-    return metadata[0], output
+    return block, output
 
 
-def prepare(input: str) -> str:
-    """:class:`str`: Prepares input code
+@lru_cache(maxsize=None)
+def _read_import(path: str) -> bytes:
+    """:class:`bytes`: Reads the content of imported file
     
     Parameters
     ----------
-    input: :class:`str`
+    path: :class:`str`
+        The path to imported file"""
+    with open(path, "rb") as reader:
+        return reader.read()
+
+
+def prepare(input: bytes) -> bytes:
+    """:class:`bytes`: Prepares input code
+    
+    Parameters
+    ----------
+    input: :class:`bytes`
         The code (content) of input file"""
-    output: str = input
-    imports: List[str] = re.findall(r"@import url\(\"(.+)\"\);", input)
-    for _import in imports:
-        name: str = os.path.join(os.path.curdir, _import.strip("/"))
-        with open(name, "r", encoding="utf8") as reader:
-            output = output.replace(f"@import url(\"{_import}\");", reader.read())
+    parts: List[bytes] = []
+    position: int = 0
+    while True:
+        start: int = input.find(_IMPORT_PREFIX, position)
+        if start < 0:
+            break
+
+        path_start: int = start + len(_IMPORT_PREFIX)
+        end: int = input.find(_IMPORT_SUFFIX, path_start)
+        if end < 0:
+            break
+
+        # Imports can't span multiple lines, leave such code as is
+        path: bytes = input[path_start:end]
+        if not path or b"\n" in path:
+            parts.append(input[position:path_start])
+            position = path_start
+            continue
 
-    return output
+        parts.append(input[position:start])
+        parts.append(_read_import(os.path.join(os.path.curdir, path.decode("utf8").strip("/"))))
+        position = end + len(_IMPORT_SUFFIX)
 
+    parts.append(input[position:])
+    return b"".join(parts)
 
-def minify(input: str, mode: str) -> str:
-    """:class:`str`: Minimizes given code (content) of input file
+
+def minify(input: bytes, mode: str) -> bytes:
+    """:class:`bytes`: Minimizes given code (content) of input file
     
     Parameters
     ----------
-    input: :class:`str`
+    input: :class:`bytes`
         The code (content) of input file
         
     mode: :class:`str`
         The minify mode (`theme` or `plugin`)"""
     if mode == "theme":
-        output: str = ""
-
-        lines: List[str] = re.split(r" *\n *", input)
-        for line in lines:
-            output += line.strip()
-
-        output = re.sub(r"(/\*.*\*/)", "", output)
-        output = re.sub(r" *\{", "{", output)
-        output = re.sub(r": *", ":", output)
-        output = re.sub(r" *, *", ",", output)
-        output = re.sub(r" *!important", "!important", output)
-        output = output.replace(";}", "}")
+        output: bytes = _STRIP_NEWLINES_RE.sub(b"", input).strip()
+        output = _COMMENT_RE.sub(b"", output)
+        output = _BRACE_RE.sub(b"{", output)
+        output = _COLON_RE.sub(b":", output)
+        output = _COMMA_RE.sub(b",", output)
+        output = _BANG_RE.sub(b"!important", output)
+        output = output.replace(b";}", b"}")
         return output
 
     return input
@@ -206,20 +293,16 @@ def get_name(config: Mapping[str, Any], metadata: Mapping[str, Any]) -> str:
     metadata: Mapping[:class:`str`, :class:`Any`]
         The metadata of project"""
     original: str = config.get("output", {}).get("name", "$name-$version.$type.$ext")
-    output: str = original
-    for placeholder in re.findall(r"\$([a-z]+)", original):
-        if placeholder not in ["name", "version", "author", "type", "ext"]:
-            continue
-
-        output = output.replace(f"${placeholder}", {
-            "name": metadata["name"].replace(" ", ""),
-            "version": metadata["version"],
-            "author": metadata["author"],
-            "type": config["type"],
-            "ext": "css" if config["type"] == "theme" else "js"
-        }[placeholder])
+    values: Mapping[str, str] = {
+        "name": metadata["name"].replace(" ", ""),
+        "version": metadata["version"],
+        "author": metadata["author"],
+        "type": config["type"],
+        "ext": "css" if config["type"] == "theme" else "js"
+    }
 
-    return output
+    # Unknown placeholders are left as is
+    return _PLACEHOLDER_RE.sub(lambda match: values.get(match.group(1), match.group(0)), original)
 
 
 def main() -> None:
@@ -230,8 +313,8 @@ def main() -> None:
     # Get input file content
     filename: str = config.get("mainFilename", type)
     input_file: str = f"{filename}.{'css' if type == 'theme' else 'js'}"
-    with open(input_file, "r", encoding="utf-8") as reader:
-        input: str = prepare(reader.read())
+    with open(input_file, "rb") as reader:
+        input: bytes = prepare(reader.read())
         size: int = len(input)
 
     log("debug", f"Found [green]{input_file}[/] file with size of [green]{humonize(size)}[/]")
@@ -245,7 +328,7 @@ def main() -> None:
 
     # If "doMimize" option is true,
     # then minify output
-    content: str = input
+    content: bytes = input
     if config.get("options", {}).get("doMimize", False):
         content = minify(input, type)
         log("info", "The content of project is minified")
@@ -256,8 +339,9 @@ def main() -> None:
     os.makedirs(folder, exist_ok=True)
 
     fullpath: str = os.path.join(folder, name)
-    with open(fullpath, "w", encoding="utf8") as writer:
-        output_size: int = writer.write(mdcomment+"\n"+content)
+    payload: bytes = mdcomment + b"\n" + content
+    with open(fullpath, "wb", buffering=1 << 18) as writer:
+        output_size: int = writer.write(payload)
 
     log("info", f"Generated file [green]{name}[/] with size of [green]{humonize(output_size)}[/]")
     log("debug", f"Output size is [green]{humonize(size-output_size)}[/] less than the input")
@@ -267,7 +351,7 @@ def main() -> None:
     if config.get("options", {}).get("autoMoveToBetterDiscordFolder", False):
         bdfolder: str = find_betterdiscord()
         log("debug", f"BetterDiscord is located by [green]{bdfolder}[/] folder")
-        shutil.copy(fullpath, os.path.join(bdfolder, type+"s", name))
+        shutil.copyfile(fullpath, os.path.join(bdfolder, type+"s", name))
         log("info", f"Generated {type} copied to BetterDiscord folder.")
         log("info", "[green]Go to Discord to see result[/]")
 